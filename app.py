@@ -5,8 +5,9 @@ from sentence_transformers import SentenceTransformer
 from huggingface_hub import InferenceClient
 from dotenv import load_dotenv
 
-from src.retrieval import load_embeddings, retrieve
+from src.retrieval import load_embeddings, retrieve_by_vector
 from src.generation import generate_answer
+from src.context import ConversationContext, REUSE_DEPTH
 
 # Configuration
 EMBEDDING_MODEL = "BAAI/bge-small-en-v1.5"
@@ -30,6 +31,10 @@ st.set_page_config(
 if "messages" not in st.session_state:
     st.session_state.messages = []
 
+# Per-session cache of recent turns for follow-up questions
+if "context" not in st.session_state:
+    st.session_state.context = ConversationContext()
+
 # Load embeddings and model once
 @st.cache_resource
 def load_rag_system():
@@ -46,6 +51,24 @@ except Exception as e:
     st.info("Please run `python main.py` first to generate embeddings.")
     st.stop()
 
+
+def answer_query(query: str) -> str:
+    """Retrieve with conversation context, reusing earlier chunks and answers where they still fit."""
+    context = st.session_state.context
+    query_vec = model.encode(query)
+    search_vec = context.contextualize(query, query_vec)
+    ranked = retrieve_by_vector(search_vec, embeddings, chunks, top_k=TOP_K * REUSE_DEPTH)
+    top_chunks = context.select_chunks(query, ranked, TOP_K)
+
+    response_text = context.cached_answer(query_vec, top_chunks)
+    if response_text is not None:
+        return response_text
+
+    response_text = generate_answer(context.rewrite_query(query), client, top_chunks)
+    context.add_turn(query, query_vec, top_chunks, response_text)
+    return response_text
+
+
 # Custom CSS styling
 st.markdown("""
 <style>
@@ -128,8 +151,7 @@ if not st.session_state.messages:
                 "content": question
             })
             with st.spinner("🔍 Searching academic catalog..."):
-                top_chunks = retrieve(question, model, embeddings, chunks, top_k=TOP_K)
-                response_text = generate_answer(question, client, top_chunks)
+                response_text = answer_query(question)
             st.session_state.messages.append({
                 "role": "assistant",
                 "content": response_text
@@ -150,6 +172,7 @@ with input_container:
             help="Clear conversation history"
         ):
             st.session_state.messages = []
+            st.session_state.context.clear()
             st.rerun()
 
 # --- PROCESS USER QUERY ---
@@ -159,8 +182,7 @@ if prompt:
         "content": prompt
     })
     with st.spinner("🔍 Searching and generating answer..."):
-        top_chunks = retrieve(prompt, model, embeddings, chunks, top_k=TOP_K)
-        response_text = generate_answer(prompt, client, top_chunks)
+        response_text = answer_query(prompt)
     st.session_state.messages.append({
         "role": "assistant",
         "content": response_text
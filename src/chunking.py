@@ -32,18 +32,18 @@ def clean_text(text: str) -> str:
     return text.strip()
 
 
-def split_into_chunks(text: str) -> list[str]:
+def split_into_chunks(text: str, chunk_size: int = CHUNK_SIZE, chunk_overlap: int = CHUNK_OVERLAP) -> list[str]:
     """Split text using LangChain RecursiveCharacterTextSplitter.
     "Recursive" tries each separator in order"""
     splitter = RecursiveCharacterTextSplitter(
-        chunk_size=CHUNK_SIZE,
-        chunk_overlap=CHUNK_OVERLAP,
+        chunk_size=chunk_size,
+        chunk_overlap=chunk_overlap,
         separators=["\n\n", "\n", ". ", " ", ""]
     )
     return splitter.split_text(text)
 
 
-def merge_semantic_chunks(chunks: list[str], model: SentenceTransformer) -> list[str]:
+def merge_semantic_chunks(chunks: list[str], model: SentenceTransformer, threshold: float = SIMILARITY_THRESHOLD) -> list[str]:
     """Merge consecutive chunks that are semantically similar."""
     if len(chunks) <= 1:
         return chunks
@@ -55,7 +55,7 @@ def merge_semantic_chunks(chunks: list[str], model: SentenceTransformer) -> list
         sim = np.dot(embeddings[i], embeddings[len(merged) - 1]) / (
             np.linalg.norm(embeddings[i]) * np.linalg.norm(embeddings[len(merged) - 1]) + 1e-10
         )
-        if sim > SIMILARITY_THRESHOLD:
+        if sim > threshold:
             merged[-1] += " " + chunks[i]
         else:
             merged.append(chunks[i])
@@ -63,7 +63,13 @@ def merge_semantic_chunks(chunks: list[str], model: SentenceTransformer) -> list
     return merged
 
 
-def chunk_catalog(pages: list[dict], model: SentenceTransformer) -> list[dict]:
+def chunk_catalog(
+    pages: list[dict],
+    model: SentenceTransformer,
+    chunk_size: int = CHUNK_SIZE,
+    chunk_overlap: int = CHUNK_OVERLAP,
+    threshold: float = SIMILARITY_THRESHOLD,
+) -> list[dict]:
     """Process all pages into chunks with page metadata."""
     all_chunks = []
     chunk_id = 0
@@ -73,8 +79,8 @@ def chunk_catalog(pages: list[dict], model: SentenceTransformer) -> list[dict]:
         if not text or len(text) < 50:      # skip near-empty pages
             continue
 
-        initial_chunks = split_into_chunks(text)
-        final_chunks = merge_semantic_chunks(initial_chunks, model)
+        initial_chunks = split_into_chunks(text, chunk_size, chunk_overlap)
+        final_chunks = merge_semantic_chunks(initial_chunks, model, threshold)
 
         for chunk in final_chunks: # metadata
             all_chunks.append({
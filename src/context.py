@@ -0,0 +1,89 @@
+# 8) keeps recent turns of a chat session to resolve follow-up questions
+
+import re
+from collections import deque
+import numpy as np
+
+MAX_TURNS = 3              # turns remembered per session
+CONTEXT_WEIGHT = 0.5       # how much earlier turns pull a follow-up query
+CONTEXT_DECAY = 0.5        # older turns count less
+REUSE_DEPTH = 2            # earlier chunks are kept if still within the top REUSE_DEPTH * top_k
+REPEAT_THRESHOLD = 0.97    # near-identical wording; also requires the same retrieved chunks
+
+# Follow-ups open with a lead-in ("and what about ...") or end on a bare
+# pronoun ("... for that?"); pronouns followed by a noun don't count
+FOLLOWUP_PATTERN = re.compile(
+    r"^(and|also|what about|how about|then|so)\b|\b(it|that|this|those|these|them|there)\s*[?.!]*$",
+    re.IGNORECASE,
+)
+
+
+def normalize(vec: np.ndarray) -> np.ndarray:
+    return vec / (np.linalg.norm(vec) + 1e-10)
+
+
+class ConversationContext:
+    """Bounded per-session cache of query embeddings, retrieved chunk ids and answers."""
+
+    def __init__(self, max_turns: int = MAX_TURNS):
+        self.turns = deque(maxlen=max_turns)
+
+    def is_followup(self, query: str) -> bool:
+        return bool(self.turns) and bool(FOLLOWUP_PATTERN.search(query.strip()))
+
+    def contextualize(self, query: str, query_vec: np.ndarray) -> np.ndarray:
+        """Blend a follow-up query's embedding with earlier turns — no extra LLM call."""
+        query_vec = normalize(query_vec)
+        if not self.is_followup(query):
+            return query_vec
+
+        context_vec = np.zeros_like(query_vec)
+        for age, turn in enumerate(reversed(self.turns)):
+            context_vec += CONTEXT_DECAY ** age * turn["query_vec"]
+        return normalize(query_vec + CONTEXT_WEIGHT * normalize(context_vec))
+
+    def topic(self, query: str) -> str:
+        """The question that started the current thread — follow-ups inherit it."""
+        return self.turns[-1]["topic"] if self.is_followup(query) else query
+
+    def rewrite_query(self, query: str) -> str:
+        """Prefix a follow-up with its thread's original question for the LLM."""
+        if not self.is_followup(query):
+            return query
+        return f"{self.topic(query)} Follow-up: {query}"
+
+    def select_chunks(self, query: str, ranked: list[dict], top_k: int) -> list[dict]:
+        """Pick top_k chunks from a full-corpus ranking (at least REUSE_DEPTH * top_k long).
+        For follow-ups, chunks the previous turn used are kept if they still rank
+        within that depth, filling at most half the context."""
+        if not self.is_followup(query):
+            return ranked[:top_k]
+
+        cached_ids = self.turns[-1]["chunk_ids"]
+        reused = [c for c in ranked if c["chunk_index"] in cached_ids][:top_k // 2]
+        fresh = [c for c in ranked if c["chunk_index"] not in cached_ids][:top_k - len(reused)]
+        return sorted(reused + fresh, key=lambda c: c["score"], reverse=True)
+
+    def cached_answer(self, query_vec: np.ndarray, top_chunks: list[dict]) -> str | None:
+        """Return an earlier answer if the question repeats and retrieves the same chunks.
+        The matching turn becomes the most recent instead of being stored twice."""
+        query_vec = normalize(query_vec)
+        chunk_ids = {c["chunk_index"] for c in top_chunks}
+        for i in reversed(range(len(self.turns))):
+            turn = self.turns[i]
+            if turn["chunk_ids"] == chunk_ids and float(query_vec @ turn["query_vec"]) >= REPEAT_THRESHOLD:
+                del self.turns[i]
+                self.turns.append(turn)
+                return turn["answer"]
+        return None
+
+    def add_turn(self, query: str, query_vec: np.ndarray, top_chunks: list[dict], answer: str):
+        self.turns.append({
+            "topic": self.topic(query),
+            "query_vec": normalize(query_vec),
+            "chunk_ids": {c["chunk_index"] for c in top_chunks},
+            "answer": answer,
+        })
+
+    def clear(self):
+        self.turns.clear()
@@ -0,0 +1,209 @@
+# 7) scores retrieval quality vs latency over a labeled question set
+
+import os
+import json
+import time
+import threading
+import itertools
+import numpy as np
+from concurrent.futures import ThreadPoolExecutor
+from sentence_transformers import SentenceTransformer
+
+from .chunking import load_pages, chunk_catalog
+from .retrieval import load_embeddings, retrieve_by_vector
+
+catalog_dir = "catalog_data"
+embeddings_dir = "catalog_embeddings"
+eval_dir = "catalog_eval"
+QUESTIONS_PATH = "eval_questions.json"
+EMBEDDING_MODEL = "BAAI/bge-small-en-v1.5"
+MAX_WORKERS = 4
+TIMING_REPEATS = 20    # timed searches per question, so percentiles have enough samples
+LABEL_CANDIDATES = 10  # chunks shown per question while labeling
+
+# Configuration grid — every combination is evaluated
+TOP_K_VALUES = [3, 6, 10]
+CHUNK_SIZE_VALUES = [300, 500, 800]
+CHUNK_OVERLAP_VALUES = [50, 100]
+SIMILARITY_THRESHOLD_VALUES = [0.85, 0.95]
+
+# Tokenizers are not safe to share across threads, so each worker loads its own model
+_worker = threading.local()
+
+
+def get_worker_model() -> SentenceTransformer:
+    if not hasattr(_worker, "model"):
+        _worker.model = SentenceTransformer(EMBEDDING_MODEL)
+    return _worker.model
+
+
+def load_questions(path: str) -> list[dict]:
+    with open(path, "r", encoding="utf-8") as f:
+        return json.load(f)
+
+
+def save_questions(questions: list[dict], path: str):
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(questions, f, indent=2, ensure_ascii=False)
+
+
+def parse_pages(answer: str) -> list[int] | None:
+    """Parse "12, 40" into [12, 40]; None if any entry isn't a page number."""
+    try:
+        pages = [int(p) for p in answer.split(",")]
+    except ValueError:
+        return None
+    return pages if all(p > 0 for p in pages) else None
+
+
+def label_questions(questions: list[dict], model: SentenceTransformer, embeddings: np.ndarray, chunks: list, path: str) -> list[dict]:
+    """Interactively fill in expected_pages using the current index as a starting point.
+    Saves after every labeled question so an interrupted session keeps its progress."""
+    for item in questions:
+        if item.get("expected_pages"):
+            continue
+
+        print("=" * 60)
+        print(item["question"])
+        print("=" * 60)
+        results = retrieve_by_vector(model.encode(item["question"]), embeddings, chunks, top_k=LABEL_CANDIDATES)
+        for r in results:
+            print(f"  Page {r['page_number']} (score: {r['score']}): {r['text'][:150]}...")
+
+        while True:
+            answer = input("\nCorrect page numbers, comma-separated (blank to skip): ").strip()
+            if not answer:
+                break
+            pages = parse_pages(answer)
+            if pages is None:
+                print("Enter page numbers only, e.g. 12, 40")
+                continue
+            item["expected_pages"] = pages
+            save_questions(questions, path)
+            break
+    return questions
+
+
+def build_index(pages: list[dict], chunk_size: int, chunk_overlap: int, threshold: float):
+    """Chunk and embed the catalog for one chunking configuration."""
+    model = get_worker_model()
+    chunks = chunk_catalog(pages, model, chunk_size, chunk_overlap, threshold)
+    embeddings = np.array(model.encode([c["text"] for c in chunks], show_progress_bar=False))
+    return embeddings, chunks
+
+
+def score_results(results: list[dict], expected_pages: list[int]) -> tuple[float, float]:
+    """Return (recall, reciprocal rank) of retrieved chunks against expected pages."""
+    expected = set(expected_pages)
+    retrieved_pages = [r["page_number"] for r in results]
+
+    recall = len(expected & set(retrieved_pages)) / len(expected)
+    reciprocal_rank = 0.0
+    for rank, page in enumerate(retrieved_pages, 1):
+        if page in expected:
+            reciprocal_rank = 1 / rank
+            break
+    return recall, reciprocal_rank
+
+
+def encode_questions(labeled: list[dict], model: SentenceTransformer) -> tuple[np.ndarray, list[float]]:
+    """Encode each question once and time it — encoding cost doesn't depend on the configuration."""
+    model.encode(labeled[0]["question"])  # warm-up, so the first timing isn't inflated
+    vecs, latencies = [], []
+    for item in labeled:
+        start = time.perf_counter()
+        vecs.append(model.encode(item["question"]))
+        latencies.append((time.perf_counter() - start) * 1000)
+    return np.array(vecs), latencies
+
+
+def evaluate_config(labeled: list[dict], question_vecs: np.ndarray, embeddings: np.ndarray, chunks: list, top_k: int) -> dict:
+    """Run every labeled question through the search step and aggregate metrics."""
+    recalls, reciprocal_ranks, latencies = [], [], []
+
+    for item, query_vec in zip(labeled, question_vecs):
+        for _ in range(TIMING_REPEATS):
+            start = time.perf_counter()
+            results = retrieve_by_vector(query_vec, embeddings, chunks, top_k=top_k)
+            latencies.append((time.perf_counter() - start) * 1000)
+
+        recall, reciprocal_rank = score_results(results, item["expected_pages"])
+        recalls.append(recall)
+        reciprocal_ranks.append(reciprocal_rank)
+
+    p50, p95, p99 = np.percentile(latencies, [50, 95, 99])
+    return {
+        "recall_at_k": round(float(np.mean(recalls)), 4),
+        "mrr": round(float(np.mean(reciprocal_ranks)), 4),
+        "search_p50_ms": round(float(p50), 3),
+        "search_p95_ms": round(float(p95), 3),
+        "search_p99_ms": round(float(p99), 3),
+        "num_chunks": len(chunks),
+        "index_size_mb": round(embeddings.nbytes / 1024 / 1024, 3),
+    }
+
+
+def run_evaluation(pages: list[dict], labeled: list[dict], question_vecs: np.ndarray) -> list[dict]:
+    """Build every index in parallel, then time the searches sequentially
+    so latencies aren't skewed by other workers."""
+    index_configs = []
+    for size, overlap, th in itertools.product(CHUNK_SIZE_VALUES, CHUNK_OVERLAP_VALUES, SIMILARITY_THRESHOLD_VALUES):
+        if overlap >= size:
+            print(f"Skipping chunk_size={size}, chunk_overlap={overlap}: overlap must be smaller than chunk size")
+            continue
+        index_configs.append((size, overlap, th))
+
+    with ThreadPoolExecutor(max_workers=MAX_WORKERS) as executor:
+        indexes = dict(zip(index_configs, executor.map(lambda cfg: build_index(pages, *cfg), index_configs)))
+
+    results = []
+    for (size, overlap, th), top_k in itertools.product(index_configs, TOP_K_VALUES):
+        embeddings, chunks = indexes[(size, overlap, th)]
+        results.append({
+            "top_k": top_k,
+            "chunk_size": size,
+            "chunk_overlap": overlap,
+            "similarity_threshold": th,
+            **evaluate_config(labeled, question_vecs, embeddings, chunks, top_k),
+        })
+    return results
+
+
+if __name__ == "__main__":
+    print("Loading model...")
+    model = SentenceTransformer(EMBEDDING_MODEL)
+    questions = load_questions(QUESTIONS_PATH)
+
+    if any(not q.get("expected_pages") for q in questions):
+        print(f"Some questions in {QUESTIONS_PATH} have no expected_pages — labeling against the current index\n")
+        embeddings, chunks = load_embeddings(embeddings_dir)
+        questions = label_questions(questions, model, embeddings, chunks, QUESTIONS_PATH)
+        print(f"\nLabels saved → {QUESTIONS_PATH}\n")
+
+    labeled = [q for q in questions if q.get("expected_pages")]
+    if not labeled:
+        raise ValueError(f"No labeled questions in {QUESTIONS_PATH} — nothing to evaluate.")
+    print(f"Evaluating on {len(labeled)} labeled questions\n")
+
+    question_vecs, encode_latencies = encode_questions(labeled, model)
+    print(f"Query encoding: {np.median(encode_latencies):.2f} ms median (same for every configuration)\n")
+
+    print("Building indexes and evaluating configurations...\n")
+    pages = load_pages(catalog_dir)
+    results = run_evaluation(pages, labeled, question_vecs)
+    results.sort(key=lambda r: (-r["recall_at_k"], -r["mrr"], r["search_p50_ms"]))
+
+    print(f"{'top_k':>5} {'size':>5} {'overlap':>7} {'thresh':>6} | {'recall':>6} {'mrr':>6} | "
+          f"{'p50 ms':>7} {'p95 ms':>7} {'p99 ms':>7} | {'chunks':>6} {'MB':>7}")
+    print("-" * 92)
+    for r in results:
+        print(f"{r['top_k']:>5} {r['chunk_size']:>5} {r['chunk_overlap']:>7} {r['similarity_threshold']:>6} | "
+              f"{r['recall_at_k']:>6} {r['mrr']:>6} | "
+              f"{r['search_p50_ms']:>7} {r['search_p95_ms']:>7} {r['search_p99_ms']:>7} | "
+              f"{r['num_chunks']:>6} {r['index_size_mb']:>7}")
+
+    os.makedirs(eval_dir, exist_ok=True)
+    output_path = os.path.join(eval_dir, "results.json")
+    with open(output_path, "w", encoding="utf-8") as f:
+        json.dump({"encode_median_ms": round(float(np.median(encode_latencies)), 2), "configs": results}, f, indent=2)
+    print(f"\nSaved results → {output_path}")
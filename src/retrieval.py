@@ -24,6 +24,11 @@ def cosine_similarity(query_vec: np.ndarray, corpus_vecs: np.ndarray) -> np.ndar
 
 def retrieve(query: str, model: SentenceTransformer, embeddings: np.ndarray, chunks: list, top_k: int = TOP_K) -> list[dict]:
     query_vec = model.encode(query)
+    return retrieve_by_vector(query_vec, embeddings, chunks, top_k=top_k)
+
+
+def retrieve_by_vector(query_vec: np.ndarray, embeddings: np.ndarray, chunks: list, top_k: int = TOP_K) -> list[dict]:
+    """Search with an already-computed query embedding."""
     scores = cosine_similarity(query_vec, embeddings)
     top_indices = np.argsort(scores)[::-1][:top_k]
 
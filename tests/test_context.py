@@ -0,0 +1,63 @@
+import numpy as np
+
+from src.context import ConversationContext
+
+
+def vec(*values):
+    return np.array(values, dtype=float)
+
+
+def chunk(chunk_index, score):
+    return {"chunk_index": chunk_index, "score": score, "page_number": 1, "text": ""}
+
+
+def test_is_followup_needs_lead_in_or_trailing_pronoun():
+    context = ConversationContext()
+    assert not context.is_followup("and what's the deadline for that?")  # no earlier turn
+
+    context.add_turn("How do I withdraw from a course?", vec(1, 0, 0), [chunk(0, 0.9)], "answer")
+    assert context.is_followup("and what's the deadline for that?")
+    assert context.is_followup("What about transfer students?")
+    assert not context.is_followup("What is the attendance policy?")
+    assert not context.is_followup("Are there scholarships for international students available at UDST?")
+    assert not context.is_followup("Can I retake a course that I failed last year?")
+
+
+def test_contextualize_blends_only_followups():
+    context = ConversationContext()
+    context.add_turn("How do I withdraw from a course?", vec(1, 0, 0), [chunk(0, 0.9)], "answer")
+
+    assert np.allclose(context.contextualize("What is the attendance policy?", vec(0, 2, 0)), vec(0, 1, 0))
+
+    blended = context.contextualize("and the deadline for that?", vec(0, 1, 0))
+    assert np.isclose(np.linalg.norm(blended), 1)
+    assert blended[0] > 0 and blended[1] > blended[0]
+
+
+def test_rewrite_keeps_thread_topic_without_growing():
+    context = ConversationContext()
+    context.add_turn("How do I withdraw from a course?", vec(1, 0, 0), [chunk(0, 0.9)], "a1")
+    context.add_turn("and for that?", vec(0, 1, 0), [chunk(0, 0.9)], "a2")
+
+    assert context.rewrite_query("what about then?") == "How do I withdraw from a course? Follow-up: what about then?"
+    assert context.rewrite_query("What is the attendance policy?") == "What is the attendance policy?"
+
+
+def test_select_chunks_reuses_cached_chunks_that_still_rank():
+    context = ConversationContext()
+    context.add_turn("How do I withdraw from a course?", vec(1, 0, 0), [chunk(7, 0.9), chunk(8, 0.9)], "answer")
+    ranked = [chunk(1, 0.9), chunk(2, 0.8), chunk(3, 0.7), chunk(7, 0.6), chunk(4, 0.5)]
+
+    assert [c["chunk_index"] for c in context.select_chunks("What is the attendance policy?", ranked, 2)] == [1, 2]
+    assert [c["chunk_index"] for c in context.select_chunks("and for that?", ranked, 2)] == [1, 7]
+
+
+def test_cached_answer_on_repeat_moves_turn_to_end():
+    context = ConversationContext()
+    context.add_turn("q1", vec(1, 0, 0), [chunk(0, 0.9)], "a1")
+    context.add_turn("q2", vec(0, 1, 0), [chunk(1, 0.9)], "a2")
+
+    assert context.cached_answer(vec(1, 0, 0), [chunk(0, 0.9)]) == "a1"
+    assert [t["answer"] for t in context.turns] == ["a2", "a1"]
+    assert context.cached_answer(vec(1, 0, 0), [chunk(5, 0.9)]) is None
+    assert context.cached_answer(vec(1, 1, 0), [chunk(0, 0.9)]) is None